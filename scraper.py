@@ -0,0 +1,1064 @@
+"""
+Logica di estrazione (normalizzazione sport, fetch, parsing, classificazione blocchi).
+Sta in un modulo a parte perché Streamlit riesegue app.py a ogni interazione: un modulo
+importato resta in sys.modules, quindi regex, XPath e cache lru sopravvivono ai rerun.
+"""
+import functools
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from html import unescape
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import lxml.html
+import requests
+import requests_cache
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+
+
+# ===============================
+# SPORT NORMALIZATION BLOCK
+# ===============================
+
+CANONICAL_SPORTS = {
+    ("M", "BASKETBALL"): "Men's Basketball",
+    ("W", "BASKETBALL"): "Women's Basketball",
+    ("M", "TENNIS"): "Men's Tennis",
+    ("W", "TENNIS"): "Women's Tennis",
+    ("M", "SWIMMING_DIVING"): "Men's Swimming & Diving",
+    ("W", "SWIMMING_DIVING"): "Women's Swimming & Diving",
+}
+
+SPORT_ALIASES = {
+    "BASKETBALL": "BASKETBALL",
+    "BBALL": "BASKETBALL",
+    "TENNIS": "TENNIS",
+    "TENN": "TENNIS",
+    "SWIM": "SWIMMING_DIVING",
+    "SWIMMING": "SWIMMING_DIVING",
+    "SWIMMING AND DIVING": "SWIMMING_DIVING",
+    "SWIMMING DIVING": "SWIMMING_DIVING",
+}
+
+GENDERED_ALIASES = {
+    "MBB": ("M", "BASKETBALL"),
+    "WBB": ("W", "BASKETBALL"),
+    "MTEN": ("M", "TENNIS"),
+    "WTEN": ("W", "TENNIS"),
+    "MSWIM": ("M", "SWIMMING_DIVING"),
+    "WSWIM": ("W", "SWIMMING_DIVING"),
+}
+
+# Punteggiatura -> spazio in una sola passata C (str.translate), senza regex
+_PUNCT_TABLE = str.maketrans({c: " " for c in "’'`./\\-_:"})
+
+@functools.lru_cache(maxsize=1024)
+def normalize_text(s: str) -> str:
+    if not s:
+        return ""
+    s = s.upper().replace("&", " AND ").translate(_PUNCT_TABLE)
+    return " ".join(s.split())
+
+@functools.lru_cache(maxsize=256)
+def detect_gender(norm: str):
+    if "WOMEN" in norm or "W" in norm.split():
+        return "W"
+    if "MEN" in norm or "M" in norm.split():
+        return "M"
+    return None
+
+@functools.lru_cache(maxsize=256)
+def resolve_sport(raw: str, default_gender=None):
+    norm = normalize_text(raw)
+
+    if norm in GENDERED_ALIASES:
+        g, cat = GENDERED_ALIASES[norm]
+        return CANONICAL_SPORTS.get((g, cat))
+
+    g = detect_gender(norm) or default_gender
+
+    cleaned = re.sub(r"\bWOMEN(S)?\b", "", norm)
+    cleaned = re.sub(r"\bMEN(S)?\b", "", cleaned).strip()
+
+    cat = SPORT_ALIASES.get(cleaned)
+
+    if not cat or not g:
+        return None
+
+    return CANONICAL_SPORTS.get((g, cat))
+
+def keyword_re(keywords) -> re.Pattern:
+    # Un'unica alternanza per tutte le keyword: il testo viene scandito una volta sola.
+    # Le più lunghe prima, così a parità di posizione vince la keyword più lunga.
+    alts = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in alts))
+
+# Tutto in UPPER perché normalizziamo il testo pagina in UPPER
+_SPORT_KW: dict[str, frozenset[str]] = {
+    "Men's Basketball": frozenset({
+        "MBB", "MEN'S BASKETBALL", "MENS BASKETBALL", "MEN BASKETBALL",
+        "BASKETBALL (M)", "BASKETBALL - MEN", "MEN'S BB", "M BASKETBALL",
+    }),
+    "Women's Basketball": frozenset({
+        "WBB", "WOMEN'S BASKETBALL", "WOMENS BASKETBALL", "WOMEN BASKETBALL",
+        "BASKETBALL (W)", "BASKETBALL - WOMEN", "WOMEN'S BB", "W BASKETBALL",
+    }),
+    "Men's Tennis": frozenset({
+        "MTEN", "MEN'S TENNIS", "MENS TENNIS", "MEN TENNIS",
+        "TENNIS (M)", "TENNIS - MEN", "M TENNIS",
+    }),
+    "Women's Tennis": frozenset({
+        "WTEN", "WOMEN'S TENNIS", "WOMENS TENNIS", "WOMEN TENNIS",
+        "TENNIS (W)", "TENNIS - WOMEN", "W TENNIS",
+    }),
+    "Men's Swimming & Diving": frozenset({
+        "MSWIM", "MEN'S SWIMMING", "MENS SWIMMING", "MEN SWIMMING",
+        "MEN'S SWIMMING AND DIVING", "MEN'S SWIMMING & DIVING",
+        "SWIMMING AND DIVING (M)", "SWIM", "SWIMMING", "SWIM & DIVE",
+        "SWIMMING & DIVING", "S&D", "S AND D",
+    }),
+    "Women's Swimming & Diving": frozenset({
+        "WSWIM", "WOMEN'S SWIMMING", "WOMENS SWIMMING", "WOMEN SWIMMING",
+        "WOMEN'S SWIMMING AND DIVING", "WOMEN'S SWIMMING & DIVING",
+        "SWIMMING AND DIVING (W)", "SWIM", "SWIMMING", "SWIM & DIVE",
+        "SWIMMING & DIVING", "S&D", "S AND D",
+    }),
+}
+
+def sport_keywords_for(canonical_sport: str) -> frozenset[str]:
+    return _SPORT_KW.get(canonical_sport) or _fallback_sport_keywords(canonical_sport)
+
+@functools.lru_cache(maxsize=64)
+def _fallback_sport_keywords(canonical_sport: str) -> frozenset[str]:
+    # Fallback: se non riconosciuto, prova a usare solo il canonico normalizzato
+    return frozenset({normalize_text(canonical_sport)})
+
+
+class LocalXPath:
+    """
+    etree.XPath compilata una volta per thread. Un'unica istanza condivisa fra i worker
+    li serializzerebbe sul lock interno di lxml (l'eval rilascia il GIL ma non il lock).
+    """
+
+    def __init__(self, path: str, **kw):
+        self.path = path
+        self.kw = kw
+        self._local = threading.local()
+
+    def __call__(self, el) -> list:
+        xp = getattr(self._local, "xp", None)
+        if xp is None:
+            xp = self._local.xp = etree.XPath(self.path, **self.kw)
+        return xp(el)
+
+
+# Testo "visibile" come get_text(" ", strip=True): niente script/style/template, niente commenti
+_TEXT_XP = LocalXPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]", smart_strings=False)
+
+_parser_local = threading.local()
+
+def html_parser() -> lxml.html.HTMLParser:
+    """
+    Un parser per thread, creato una volta sola: il parser condiviso di lxml.html
+    serializza i parse dei worker sul proprio lock.
+    (Commenti lasciati nel tree: rimuoverli fonderebbe i testi adiacenti, "a<!-- -->b" -> "ab".)
+    """
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = lxml.html.HTMLParser()
+    return parser
+
+def parse_html(html: str) -> lxml.html.HtmlElement:
+    try:
+        return lxml.html.document_fromstring(html, parser=html_parser())
+    except ValueError:
+        # str con dichiarazione <?xml ... encoding=...?>: lxml vuole i bytes
+        return parse_html(html.encode("utf-8"))
+    except etree.ParserError:
+        # documento vuoto
+        return lxml.html.document_fromstring("<html><body></body></html>", parser=html_parser())
+
+def node_text(el) -> str:
+    return " ".join(t for t in (s.strip() for s in _TEXT_XP(el)) if t)
+
+def css_class_xpath(cls: str) -> str:
+    return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+# XPath compilate una volta sola (tree.xpath(str) ricompila l'espressione a ogni chiamata)
+_HEADINGS_XP = LocalXPath("//h1 | //h2 | //h3")
+_NAV_XP = LocalXPath(
+    " | ".join(
+        ["//nav", css_class_xpath("breadcrumb"), css_class_xpath("breadcrumbs"), css_class_xpath("site-nav"), "//header"]
+    )
+)
+
+
+@functools.lru_cache(maxsize=64)
+def sport_keyword_re(canonical_sport: str) -> re.Pattern:
+    # Lookahead: trova una keyword per ogni posizione, anche sovrapposte
+    return re.compile(f"(?=({keyword_re(sport_keywords_for(canonical_sport)).pattern}))")
+
+
+def page_sport_confidence(tree: lxml.html.HtmlElement, canonical_sport: str) -> tuple[int, list[str]]:
+    """
+    Ritorna (score, matches). Score = quante keyword trovate.
+    Usiamo solo segnali "forti" (title, headings, nav/breadcrumb) per evitare falsi positivi.
+    """
+    # testo "forte"
+    parts = []
+
+    title = tree.find(".//title")
+    if title is not None and title.text:
+        parts.append(title.text)
+
+    # Headings
+    for h in _HEADINGS_XP(tree):
+        txt = node_text(h)
+        if txt:
+            parts.append(txt)
+
+    # breadcrumb / nav spesso contiene lo sport
+    for el in _NAV_XP(tree):
+        txt = node_text(el)
+        if txt:
+            parts.append(txt)
+
+    strong_text = normalize_text(" ".join(parts))
+    # normalize_text mette AND ecc.; qui vogliamo UPPER (la tua normalize_text già fa UPPER)
+    kw = sport_keywords_for(canonical_sport)
+
+    # Ogni keyword presente è prefisso di quella trovata nella sua posizione
+    found = set(sport_keyword_re(canonical_sport).findall(strong_text))
+    matches = [k for k in kw if any(k in f for f in found)]
+    score = len(matches)
+
+    # Bonus score se la keyword include esplicitamente MEN/WOMEN e compare
+    # (riduce ambiguità tennis/swimming)
+    # Al più una scansione: il genere del target decide quale token cercare
+    if canonical_sport.startswith("Women"):
+        score += "WOMEN" in strong_text
+    elif canonical_sport.startswith("Men"):
+        score += "MEN" in strong_text
+
+    return score, matches
+
+
+def page_likely_matches_target_sport(tree: lxml.html.HtmlElement, target_sport: str) -> bool:
+    """
+    Decide se la pagina è coerente con lo sport target.
+    Regola: almeno 1 match "forte" + coerenza genere (se presente) con un piccolo bonus.
+    """
+    score, _ = page_sport_confidence(tree, target_sport)
+    return score >= 1
+
+
+# ===============================
+# END SPORT BLOCK
+# ===============================
+
+
+# ============================ SCRAPER LOGIC ============================
+
+MAX_WORKERS = 8
+# Bio della stessa università scaricate in parallelo
+BIO_WORKERS = 4
+# Distanza minima tra due richieste verso lo stesso host
+HOST_INTERVAL_S = 0.6
+
+# Cache HTTP su disco: le pagine staff cambiano di rado, i rerun sullo stesso CSV non rifanno le GET
+HTTP_CACHE_NAME = "coach_cache"
+HTTP_CACHE_EXPIRE_S = 24 * 3600
+
+# Connessioni keep-alive: un pool per host, abbastanza grande per tutti i worker in volo
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
+# Pagine sport/staff directory tenute in memoria durante una run (LRU)
+PAGE_CACHE_SIZE = 128
+
+# Oltre questa dimensione il resto della pagina viene scartato
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+EMAIL_RE = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.IGNORECASE)
+
+# href mailto di un <a>, letti dall'HTML grezzo senza parse. Come _MAILTO_HREF_XP:
+# solo <a href="mailto:...">, con "mailto:" minuscolo in testa al valore
+MAILTO_RE = re.compile(r"""(?i:<a\s(?:[^>]*?\s)?href\s*=\s*["']?)mailto:([^"'?>\s]+)""")
+
+# Segnali minimi di un'email nell'HTML grezzo (oltre a "@"): entità di "@", mailto, "at" offuscato,
+# protezione email di Cloudflare
+MAYBE_EMAIL_RE = re.compile(
+    r"&#0*64;|&#x0*40;|&commat;|mailto:|[\[(]at[\])]|\sat\s|data-cfemail|email-protection#", re.IGNORECASE
+)
+
+OBFUSCATIONS: List[Tuple[str, str]] = [
+    (r"\s*\[at\]\s*", "@"),
+    (r"\s*\(at\)\s*", "@"),
+    (r"\s+at\s+", "@"),
+    (r"\s*\[dot\]\s*", "."),
+    (r"\s*\(dot\)\s*", "."),
+    (r"\s+dot\s+", "."),
+]
+
+# Regole applicate in sequenza, nell'ordine della tabella: una regola può consumare gli spazi
+# che servirebbero alla successiva (" AT [at]x" -> " AT@x"), e un'unica alternanza lo cambierebbe
+OBFUSCATION_RULES = [(re.compile(pat, re.IGNORECASE), repl) for pat, repl in OBFUSCATIONS]
+
+TARGET_ROLE_KEYWORDS = [
+    "head coach",
+    "assistant coach",
+    "asst coach",
+    "associate head coach",
+    "associate coach",
+    "interim head coach",
+    "coach",
+    "recruiting",
+    "recruiting coordinator",
+    "recruiting coord",
+    "director of recruiting",
+    "recruiting director",
+    "recruiting operations",
+    "recruiting ops",
+    "coordinator of recruiting",
+]
+
+EXCLUDE_ROLE_KEYWORDS = [
+    "student assistant",
+    "student asst",
+    "student-athlete assistant",
+    "graduate assistant",
+    "grad assistant",
+    "grad asst",
+]
+
+TARGET_ROLE_RE = keyword_re(TARGET_ROLE_KEYWORDS)
+EXCLUDE_ROLE_RE = keyword_re(EXCLUDE_ROLE_KEYWORDS)
+
+# Segmenti di path che indicano una pagina bio/staff (match per sottostringa, come prima)
+BIO_PATH_HINTS = ["/staff", "/coaches", "/coach", "/people", "/person", "/bio", "/roster"]
+BIO_PATH_RE = keyword_re(BIO_PATH_HINTS)
+
+EXCLUDE_ABBREV_RE = re.compile(r"\b(?:ga|g\.a\.|sa|s\.a\.)\b", re.IGNORECASE)
+
+# Zone che il parse non legge come testo: commenti, script, style, template
+HIDDEN_HTML_RE = re.compile(r"<!--.*?-->|<(script|style|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+# Tag HTML (non "a < b" nel testo), con i ">" dentro i valori quotati degli attributi:
+# sostituiti con uno spazio, come fa node_text tra i nodi
+TAG_RE = re.compile(r"""<[A-Za-z/!?](?:[^>"']|"[^"]*"|'[^']*')*>""")
+
+# Blocchi candidati, in ordine di priorità: prima le classi note, poi i tag generici
+BLOCK_CLASSES = [
+    "sidearm-staff-directory__item",
+    "sidearm-roster-coach",
+    "staff-member",
+    "coaches-item",
+    "coach",
+    "bio",
+]
+BLOCK_TAGS = ["article", "li", "div"]
+BLOCK_CLASSES_XPATH = " | ".join(css_class_xpath(c) for c in BLOCK_CLASSES)
+
+_BLOCK_CLASSES_XP = LocalXPath(BLOCK_CLASSES_XPATH)
+_ROWS_XP = LocalXPath("//table//tr")
+# Relative: valgono sia sul documento sia su un singolo blocco
+_MAILTO_HREF_XP = LocalXPath('.//a[starts-with(@href, "mailto:")]/@href', smart_strings=False)
+_LINKS_XP = LocalXPath(".//a[@href]")
+# Solo gli attributi che in pratica portano email (niente class/id/style/src...)
+_EMAIL_ATTRS_XP = LocalXPath(
+    ".//@href | .//@title | .//@alt | .//@content | .//@aria-label | .//@*[starts-with(name(), 'data-')]",
+    smart_strings=False,
+)
+# Nodi che possono portare un'email fuori dal testo (per la ricerca a livello pagina)
+_EMAIL_NODES_XP = LocalXPath(
+    '//a[starts-with(@href, "mailto:")] | //a[contains(@href, "/cdn-cgi/l/email-protection#")]'
+    " | //*[@data-cfemail]"
+)
+# Email protette da Cloudflare: <span data-cfemail="HEX"> o <a href="/cdn-cgi/l/email-protection#HEX">
+_CFEMAIL_XP = LocalXPath(
+    ".//@data-cfemail | .//a[contains(@href, '/cdn-cgi/l/email-protection#')]/@href",
+    smart_strings=False,
+)
+
+# Frozen => hashable: righe duplicate del CSV si processano una volta sola
+@dataclass(frozen=True, slots=True)
+class Target:
+    university: str
+    sport: str
+    url: str
+    staff_directory_url: str = ""
+
+def deobfuscate(text: str) -> str:
+    # Ogni regola contiene "at" o "dot": se mancano entrambi non c'è nulla da sostituire
+    low = text.lower()
+    if "at" not in low and "dot" not in low:
+        return text
+    for pat, repl in OBFUSCATION_RULES:
+        text = pat.sub(repl, text)
+    return text
+
+def norm(s: str) -> str:
+    return " ".join(s.lower().split())
+
+def make_session(use_cache: bool = True) -> requests.Session:
+    if use_cache:
+        s = requests_cache.CachedSession(
+            HTTP_CACHE_NAME,
+            backend="sqlite",
+            expire_after=HTTP_CACHE_EXPIRE_S,
+            allowable_methods=("GET",),
+        )
+    else:
+        s = requests.Session()
+    s.headers.update({
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                      "AppleWebKit/537.36 (KHTML, like Gecko) "
+                      "Chrome/120.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Connection": "keep-alive",
+    })
+
+    # Il pool di default (10) sotto concorrenza scarta connessioni e rifà l'handshake TLS.
+    # Retry-After ignorato: un valore enorme bloccherebbe un worker, basta il backoff.
+    adapter = CrawlAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=False,
+        ),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+class HostLimiter:
+    """
+    Distanzia le richieste verso lo stesso host di almeno `interval` secondi.
+    Thread-safe: ogni chiamata prenota il proprio slot e dorme fuori dal lock,
+    quindi host diversi non si aspettano mai tra loro.
+    """
+
+    def __init__(self, interval: float = HOST_INTERVAL_S):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def acquire(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, host: str, seconds: float) -> None:
+        # Rimanda la prossima richiesta verso host di almeno `seconds`, senza bloccare chi chiama
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), until)
+
+@functools.lru_cache(maxsize=4096)
+def url_host(url: str) -> str:
+    # Gli stessi URL/host tornano di continuo (fetch, limiter, raggruppamento): urlsplit una volta sola
+    return urlsplit(url).netloc.lower()
+
+# HostLimiter della fetch in corso nel thread, letto da CrawlAdapter
+_pacing_local = threading.local()
+
+class CrawlAdapter(HTTPAdapter):
+    """
+    HTTPAdapter che distanzia le richieste con il HostLimiter della fetch in corso e
+    legge al massimo MAX_PAGE_BYTES di corpo per risposta.
+    requests-cache chiama l'adapter solo quando va davvero in rete (miss o rivalidazione):
+    le pagine servite dalla cache sqlite non aspettano il limiter, e in cache finisce
+    solo il corpo già troncato. Ogni redirect passa di qui, quindi viene distanziato sul proprio host.
+    """
+
+    def send(self, request, **kwargs):
+        limiter = getattr(_pacing_local, "limiter", None)
+        if limiter is not None:
+            limiter.acquire(url_host(request.url))
+        r = super().send(request, **kwargs)
+
+        chunks = []
+        size = 0
+        for chunk in r.iter_content(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_PAGE_BYTES:
+                break
+        # Oltre il limite il resto non si scarica: la connessione si chiude invece di tornare al pool
+        r.close()
+        r._content = b"".join(chunks)[:MAX_PAGE_BYTES]
+        r._content_consumed = True
+        return r
+
+def fetch(session: requests.Session, url: str, timeout: int = 10, limiter: Optional[HostLimiter] = None) -> str:
+    # Limiter e limite di dimensione li applica CrawlAdapter (montato da make_session)
+    _pacing_local.limiter = limiter
+    try:
+        r = session.get(url, timeout=timeout, allow_redirects=True)
+    finally:
+        _pacing_local.limiter = None
+    try:
+        r.raise_for_status()
+        raw = r.content[:MAX_PAGE_BYTES]
+    finally:
+        r.close()
+
+    try:
+        return raw.decode(r.encoding or "utf-8", errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+def find_emails(text: str) -> List[str]:
+    # Senza "@" EMAIL_RE non può matchare: il test di sottostringa costa molto meno della findall
+    return EMAIL_RE.findall(text) if "@" in text else []
+
+class PageCache:
+    """
+    Pagine sport/staff directory già scaricate in questa run, per URL.
+    Più righe dello stesso ateneo condividono la staff directory: niente nuova GET e niente
+    attesa sul limiter. LRU limitata: i target di uno stesso host girano uno dopo l'altro.
+    """
+
+    def __init__(self, maxsize: int = PAGE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._pages: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            html = self._pages.get(url)
+            if html is not None:
+                self._pages.move_to_end(url)
+            return html
+
+    def put(self, url: str, html: str) -> None:
+        with self._lock:
+            self._pages[url] = html
+            self._pages.move_to_end(url)
+            while len(self._pages) > self.maxsize:
+                self._pages.popitem(last=False)
+
+def fetch_page(
+    session: requests.Session,
+    url: str,
+    limiter: Optional[HostLimiter] = None,
+    pages: Optional[PageCache] = None
+) -> str:
+    if pages is not None:
+        html = pages.get(url)
+        if html is not None:
+            return html
+    html = fetch(session, url, limiter=limiter)
+    if pages is not None:
+        pages.put(url, html)
+    return html
+
+def clean_emails(emails) -> Set[str]:
+    # Forma canonica all'inserimento: Joe@X.edu e joe@x.edu sono la stessa casella
+    return {e.strip().lower() for e in emails if e.strip()}
+
+def may_contain_email(html: str) -> bool:
+    return "@" in html or MAYBE_EMAIL_RE.search(html) is not None
+
+def mailto_address(href: str) -> str:
+    return href.split("mailto:", 1)[1].split("?", 1)[0].strip()
+
+def decode_cfemail(hexstr: str) -> str:
+    # Primo byte = chiave, gli altri sono i caratteri dell'email in XOR con la chiave
+    try:
+        data = bytes.fromhex(hexstr)
+    except ValueError:
+        return ""
+    if len(data) < 2:
+        return ""
+    key = data[0]
+    try:
+        return bytes(b ^ key for b in data[1:]).decode("utf-8")
+    except UnicodeDecodeError:
+        return ""
+
+def _cf_address(payload: str) -> Optional[str]:
+    # payload: valore di data-cfemail o href ".../email-protection#HEX". Unica regola di validazione
+    # per pagine e bio: conta solo un'email completa
+    e = decode_cfemail(payload.rsplit("#", 1)[-1].strip())
+    return e if EMAIL_RE.fullmatch(e) else None
+
+def cloudflare_emails(el) -> Set[str]:
+    emails: Set[str] = set()
+    for val in _CFEMAIL_XP(el):
+        e = _cf_address(val)
+        if e:
+            emails.add(e)
+    return emails
+
+def extract_emails_anywhere(
+    tree: lxml.html.HtmlElement,
+    text: Optional[str] = None,
+    clear: Optional[str] = None
+) -> Set[str]:
+    # text/clear: testo del nodo e sua versione deobfuscata, se il chiamante li ha già
+    emails: Set[str] = set()
+
+    for href in _MAILTO_HREF_XP(tree):
+        e = mailto_address(href)
+        if e:
+            emails.add(e)
+
+    emails.update(cloudflare_emails(tree))
+
+    if text is None:
+        text = node_text(tree)
+    if clear is None:
+        clear = deobfuscate(text)
+    emails.update(find_emails(clear))
+
+    # Il giro sugli attributi costa O(tag x attributi) e serve quasi mai:
+    # solo se mailto + testo non hanno dato nulla, o se la pagina usa [at]/(at).
+    low = text.lower()
+    if not emails or "[at]" in low or "(at)" in low:
+        # Tutti i valori in un unico buffer: una sola deobfuscate e una sola findall.
+        # "\x00" non è né spazio né carattere email, quindi nessun match attraversa i pezzi.
+        attrs = _EMAIL_ATTRS_XP(tree)
+        emails.update(find_emails(deobfuscate("\x00".join(attrs))))
+
+    return clean_emails(emails)
+
+def find_candidate_blocks(tree: lxml.html.HtmlElement) -> List:
+    rows = _ROWS_XP(tree)
+    if len(rows) >= 5:
+        return rows
+
+    # Un passaggio per tutte le classi note e uno per i tag generici (invece di uno per selettore):
+    # ogni elemento finisce nel bucket di ogni selettore che soddisfa, in ordine di documento.
+    by_class: Dict[str, list] = {c: [] for c in BLOCK_CLASSES}
+    for el in _BLOCK_CLASSES_XP(tree):
+        for c in set(el.get("class", "").split()):
+            if c in by_class:
+                by_class[c].append(el)
+
+    for c in BLOCK_CLASSES:
+        if 5 <= len(by_class[c]) <= 400:
+            return by_class[c]
+
+    by_tag: Dict[str, list] = {t: [] for t in BLOCK_TAGS}
+    for el in tree.iter(*BLOCK_TAGS):
+        by_tag[el.tag].append(el)
+
+    for t in BLOCK_TAGS:
+        if 5 <= len(by_tag[t]) <= 400:
+            return by_tag[t]
+
+    body = tree.find("body")
+    return [body] if body is not None else [tree]
+
+def is_excluded_block(text: str) -> bool:
+    if EXCLUDE_ROLE_RE.search(text):
+        return True
+    # text è già normalizzato (minuscolo): senza "ga"/"sa" le sigle non possono esserci
+    if "ga" not in text and "sa" not in text and "g.a" not in text and "s.a" not in text:
+        return False
+    return EXCLUDE_ABBREV_RE.search(text) is not None
+
+def is_target_block(text: str) -> bool:
+    # Prima il ruolo: la maggior parte dei blocchi non ne ha e si ferma a una sola scansione
+    if TARGET_ROLE_RE.search(text) is None:
+        return False
+    return not is_excluded_block(text)
+
+_SPORT_CLEAN_RE = re.compile(r"[^a-z0-9\s']")
+
+@functools.lru_cache(maxsize=64)
+def sport_tokens(sport: str) -> FrozenSet[str]:
+    s = sport.strip().lower()
+    s_clean = " ".join(_SPORT_CLEAN_RE.sub(" ", s).split())
+
+    tokens: Set[str] = set()
+    if s_clean:
+        tokens.add(s_clean)
+        tokens.add(s_clean.replace("’", "'"))
+        tokens.add(s_clean.replace("'", ""))
+
+    for w in s_clean.split():
+        if len(w) >= 4:
+            tokens.add(w)
+            
+    if "swim" in s_clean or "swimming" in s_clean:
+        tokens.add("swimming")
+        tokens.add("swim")
+        tokens.add("swimming and diving")
+        tokens.add("swimming & diving")
+        tokens.add("swim and dive")
+        tokens.add("swim & dive")
+        tokens.add("swimdive")
+
+    if "basketball" in s_clean:
+        tokens.add("basketball")
+        if "men" in s_clean:
+            tokens.add("mbkb")
+            tokens.add("m basketball")
+            tokens.add("mens basketball")
+        if "women" in s_clean:
+            tokens.add("wbkb")
+            tokens.add("w basketball")
+            tokens.add("womens basketball")
+
+    if "soccer" in s_clean:
+        tokens.add("soccer")
+        if "men" in s_clean:
+            tokens.add("msoc")
+            tokens.add("mens soccer")
+        if "women" in s_clean:
+            tokens.add("wsoc")
+            tokens.add("womens soccer")
+
+    return frozenset(t for t in tokens if t)
+
+def is_swim_target(sport: str) -> bool:
+    s = sport.strip().lower()
+    return "swim" in s or "swimming" in s
+
+def is_diving_only(text: str) -> bool:
+    # il tuo `text` arriva già normalizzato da norm() -> lowercase
+    has_diving = ("diving" in text) or (" dive " in f" {text} ") or ("diver" in text)
+    has_swim = ("swimming" in text) or (" swim " in f" {text} ") or ("swim&dive" in text) or ("swim and dive" in text)
+
+    return has_diving and not has_swim
+
+@functools.lru_cache(maxsize=256)
+def sport_token_re(sport: str):
+    tks = sport_tokens(sport)
+    return keyword_re(tks) if tks else None
+
+@functools.lru_cache(maxsize=256)
+def sport_filter(sport: str) -> Callable[[str], bool]:
+    """
+    Predicato "il blocco è dello sport giusto" già risolto per uno sport: token, regex e regola diving
+    calcolati una volta per target, non a ogni blocco.
+    """
+    pat = sport_token_re(sport)
+    swim = is_swim_target(sport)
+
+    def match(text: str) -> bool:
+        # 🔥 regola speciale: se target è swimming(/&diving), escludi i blocchi "diving-only"
+        if swim and is_diving_only(text):
+            return False
+        return pat is None or pat.search(text) is not None
+
+    return match
+
+# (elemento del blocco, suo testo deobfuscato con le maiuscole originali)
+TargetBlock = Tuple[lxml.html.HtmlElement, str]
+
+def target_blocks(tree: lxml.html.HtmlElement, sport: str, require_sport_match: bool) -> List[TargetBlock]:
+    """
+    Blocchi candidati che parlano di un ruolo target (e dello sport, se richiesto), come
+    (elemento, testo deobfuscato). Calcolati una volta per pagina e condivisi tra estrazione
+    email e raccolta bio: il testo del blocco si estrae una volta sola.
+    """
+    out = []
+    matches_sport = sport_filter(sport) if require_sport_match else None
+    for b in find_candidate_blocks(tree):
+        text = deobfuscate(node_text(b))
+        bt = norm(text)
+        if not is_target_block(bt):
+            continue
+        if matches_sport is not None and not matches_sport(bt):
+            continue
+        out.append((b, text))
+    return out
+
+def collect_bio_links_from_target_blocks(blocks: List[TargetBlock], base_url: str) -> List[str]:
+    links: Set[str] = set()
+
+    # Base parsata una volta sola per pagina, non per ogni link
+    base = urlsplit(base_url)
+    base_netloc = url_host(base_url)
+
+    for b, _ in blocks:
+        for a in _LINKS_XP(b):
+            href = a.get("href", "").strip()
+            if not href:
+                continue
+            if href.startswith("mailto:") or href.startswith("tel:"):
+                continue
+
+            if href.startswith("/") and not href.startswith("//") and "/." not in href:
+                # Fast path: path assoluto sullo stesso host, niente urljoin/urlparse
+                abs_url = f"{base.scheme}://{base.netloc}{href}"
+                p = href.split("#", 1)[0].split("?", 1)[0].lower()
+            else:
+                abs_url = urljoin(base_url, href)
+                parts = urlsplit(abs_url)
+                if parts.netloc.lower() != base_netloc:
+                    continue
+                p = parts.path.lower()
+
+            if BIO_PATH_RE.search(p):
+                links.add(abs_url)
+
+    return sorted(links)
+
+def extract_target_emails_from_page(blocks: List[TargetBlock]) -> Set[str]:
+    emails: Set[str] = set()
+    if not blocks:
+        return emails
+
+    # Una sola XPath sulla pagina per mailto e Cloudflare, poi si risale agli antenati per
+    # sapere se il nodo sta in un blocco target (invece di due XPath per ogni blocco).
+    # Stesse regole delle query per blocco: i link contano solo dentro il blocco,
+    # data-cfemail anche sul blocco stesso.
+    owners = {b for b, _ in blocks}
+    for el in _EMAIL_NODES_XP(blocks[0][0].getroottree()):
+        inside = any(a in owners for a in el.iterancestors())
+        if not inside and el not in owners:
+            continue
+
+        if inside and el.tag == "a":
+            href = el.get("href", "")
+            if href.startswith("mailto:"):
+                e = mailto_address(href)
+                if e:
+                    emails.add(e)
+            if "/cdn-cgi/l/email-protection#" in href:
+                e = _cf_address(href)
+                if e:
+                    emails.add(e)
+
+        cf = el.get("data-cfemail")
+        if cf is not None:
+            e = _cf_address(cf)
+            if e:
+                emails.add(e)
+
+    # Testi già deobfuscati da target_blocks, in un solo buffer: una findall per pagina.
+    # "\x00" non è spazio né carattere email: nessun match attraversa i confini tra blocchi.
+    emails.update(find_emails("\x00".join(text for _, text in blocks)))
+    return clean_emails(emails)
+
+def analyze_page(html: str, sport: str, require_sport_match: bool) -> Tuple[Set[str], List[TargetBlock]]:
+    """
+    Un parse e una passata di classificazione per pagina: ritorna (email dirette, blocchi target).
+    I blocchi servono ai link bio, che si cercano solo se le email dirette mancano.
+    """
+    # Ogni keyword target contiene "coach" o "recruiting": senza, nessun blocco può qualificarsi
+    # e non servono né le email né i link bio (pagine JS-only, pagine di errore...)
+    low = html.lower()
+    if "coach" not in low and "recruiting" not in low:
+        return set(), []
+
+    blocks = target_blocks(parse_html(html), sport, require_sport_match)
+    emails = extract_target_emails_from_page(blocks) if may_contain_email(html) else set()
+    return emails, blocks
+
+def bio_emails_without_parse(html: str) -> Optional[Set[str]]:
+    """
+    Email di una bio ricavate dall'HTML grezzo, o None se serve il percorso completo.
+    Dà lo stesso risultato del parse solo se:
+    - ogni "mailto:" della pagina è l'href di un <a> fuori da commenti/script/style/template
+      (niente JSON-LD, document.write, <link href="mailto:"> o link commentati);
+    - i mailto sono indirizzi puliti (entità, %40 e simili vanno nel percorso completo);
+    - niente Cloudflare, niente [at]/(at) (farebbero partire il giro sugli attributi)
+      e nel testo nessuna email oltre ai mailto;
+    - il testo visibile non fa scattare le esclusioni.
+    """
+    low = html.lower()
+    if "cfemail" in low or "email-protection#" in low:
+        return None
+
+    shown = HIDDEN_HTML_RE.sub(" ", html)
+    low_shown = shown.lower()
+    # Commenti/script non chiusi: il parse li legge in modo diverso
+    if "<!--" in low_shown or "<script" in low_shown or "<style" in low_shown or "<template" in low_shown:
+        return None
+
+    mailtos = MAILTO_RE.findall(shown)
+    if not mailtos or len(mailtos) != low.count("mailto:") or not all(EMAIL_RE.fullmatch(e) for e in mailtos):
+        return None
+
+    # Le esclusioni vanno cercate sul testo e non sull'HTML:
+    # "Graduate&nbsp;Assistant" o "<b>Graduate</b> <b>Assistant</b>" sfuggirebbero
+    text = unescape(TAG_RE.sub(" ", shown))
+    low_text = text.lower()
+    if "[at]" in low_text or "(at)" in low_text:
+        return None
+    clear = deobfuscate(text)
+    if is_excluded_block(norm(clear)):
+        return None
+
+    emails = clean_emails(mailtos)
+    if not clean_emails(find_emails(clear)) <= emails:
+        return None
+    return emails
+
+def emails_from_bio(session: requests.Session, url: str, limiter: Optional[HostLimiter] = None) -> Set[str]:
+    bio_html = fetch(session, url, limiter=limiter)
+    if not may_contain_email(bio_html):
+        return set()
+
+    # Fast path: quasi tutte le bio hanno un link mailto pulito e il parse si salta del tutto
+    fast = bio_emails_without_parse(bio_html)
+    if fast is not None:
+        return fast
+
+    bio_tree = parse_html(bio_html)
+
+    # Testo e deobfuscate una volta sola: servono sia per le esclusioni sia per le email
+    text = node_text(bio_tree)
+    clear = deobfuscate(text)
+    if is_excluded_block(norm(clear)):
+        return set()
+
+    return extract_emails_anywhere(bio_tree, text, clear)
+
+def extract_from_bios(
+    session: requests.Session,
+    base_url: str,
+    blocks: List[TargetBlock],
+    max_bios: int = 30,
+    sleep_s: float = HOST_INTERVAL_S,
+    limiter: Optional[HostLimiter] = None,
+    bio_cache: Optional[Dict[str, FrozenSet[str]]] = None
+) -> Set[str]:
+    bio_links = collect_bio_links_from_target_blocks(blocks, base_url)[:max_bios]
+
+    # Le bio sono tutte sullo stesso host: il limiter le fa partire a distanza di sleep_s,
+    # ma fino a BIO_WORKERS restano in volo insieme invece di aspettarsi a vicenda.
+    if limiter is None:
+        limiter = HostLimiter(sleep_s)
+
+    # Bio già visitate in questa run (stesso coach su più target): niente nuova GET né parse
+    if bio_cache is None:
+        bio_cache = {}
+
+    emails: Set[str] = set()
+    todo = []
+    for u in bio_links:
+        if u in bio_cache:
+            emails.update(bio_cache[u])
+        else:
+            todo.append(u)
+
+    with ThreadPoolExecutor(max_workers=BIO_WORKERS) as ex:
+        futures = {ex.submit(emails_from_bio, session, u, limiter): u for u in todo}
+
+        for fut, u in futures.items():
+            try:
+                found = frozenset(fut.result())
+            except Exception:
+                continue
+            bio_cache[u] = found
+            emails.update(found)
+
+    return emails
+
+def join_emails(emails: Set[str]) -> str:
+    # Già minuscole (clean_emails): basta l'ordinamento naturale
+    return ", ".join(sorted(emails))
+
+def process_one_target(
+    session: requests.Session,
+    t: Target,
+    sleep_s: float = 1.2,
+    limiter: Optional[HostLimiter] = None,
+    bio_cache: Optional[Dict[str, FrozenSet[str]]] = None,
+    pages: Optional[PageCache] = None
+) -> Set[str]:
+    emails: Set[str] = set()
+    if limiter is None:
+        limiter = HostLimiter()
+
+    html = fetch_page(session, t.url, limiter=limiter, pages=pages)
+    found, blocks = analyze_page(html, t.sport, require_sport_match=False)
+    emails.update(found)
+
+    if not emails:
+        emails.update(extract_from_bios(session, t.url, blocks, limiter=limiter, bio_cache=bio_cache))
+
+    if not emails and t.staff_directory_url.strip():
+        sdu = t.staff_directory_url.strip()
+        sd_html = fetch_page(session, sdu, limiter=limiter, pages=pages)
+        found, sd_blocks = analyze_page(sd_html, t.sport, require_sport_match=True)
+        emails.update(found)
+
+        if not emails:
+            emails.update(extract_from_bios(session, sdu, sd_blocks, limiter=limiter, bio_cache=bio_cache))
+
+    time.sleep(sleep_s)
+    return emails
+
+def group_targets_by_host(targets: List[Target]) -> Dict[str, deque]:
+    groups: Dict[str, deque] = {}
+    for idx, t in enumerate(targets):
+        host = url_host(t.url)
+        groups.setdefault(host, deque()).append((idx, t))
+    return groups
+
+def run_targets(
+    session: requests.Session,
+    targets: List[Target],
+    sleep_s: float = 1.2,
+    max_workers: int = MAX_WORKERS
+) -> Iterator[Tuple[int, Target, Set[str]]]:
+    """
+    Processa i target in parallelo e restituisce (indice, target, emails) man mano che finiscono.
+    Un solo target alla volta per host; la pausa tra target dello stesso host passa dal
+    limiter, così il worker si libera subito e il risultato arriva senza attendere sleep_s.
+    """
+    queues = group_targets_by_host(targets)
+    limiter = HostLimiter()
+    bio_cache: Dict[str, FrozenSet[str]] = {}
+    pages = PageCache()
+    pending = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        def submit_next(host: str):
+            idx, t = queues[host].popleft()
+            fut = ex.submit(process_one_target, session, t, 0, limiter, bio_cache, pages)
+            pending[fut] = (host, idx, t)
+
+        try:
+            for host in queues:
+                submit_next(host)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    host, idx, t = pending.pop(fut)
+                    limiter.pause(host, sleep_s)
+                    if queues[host]:
+                        submit_next(host)
+                    yield idx, t, fut.result()
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+def run_unique_targets(
+    session: requests.Session,
+    targets: List[Target],
+    sleep_s: float = 1.2,
+    max_workers: int = MAX_WORKERS
+) -> Iterator[Tuple[List[int], Target, Set[str]]]:
+    """
+    Come run_targets, ma i target identici (stessa riga ripetuta nel CSV) vanno in rete una
+    volta sola: restituisce (indici delle righe, target, emails) man mano che finiscono.
+    """
+    rows_of: Dict[Target, List[int]] = {}
+    for i, t in enumerate(targets):
+        rows_of.setdefault(t, []).append(i)
+
+    for _, t, emails in run_targets(session, list(rows_of), sleep_s=sleep_s, max_workers=max_workers):
+        yield rows_of[t], t, emails
@@ -0,0 +1,427 @@
+import random
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import scraper
+
+BASE = "https://athletics.example.edu"
+
+
+class FakeSession:
+    """Sessione finta: serve le pagine di `pages` per URL e registra le GET."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        r = requests.Response()
+        r.url = url
+        r.status_code = 200 if url in self.pages else 404
+        r._content = self.pages.get(url, "").encode("utf-8")
+        r._content_consumed = True
+        r.encoding = "utf-8"
+        return r
+
+
+class CountingLimiter(scraper.HostLimiter):
+    def __init__(self):
+        super().__init__(0)
+        self.hosts = []
+
+    def acquire(self, host):
+        self.hosts.append(host)
+        super().acquire(host)
+
+
+@pytest.fixture
+def http_server():
+    """Server HTTP locale: GET /size/<n> restituisce n byte, GET /<altro> una pagina breve."""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            if self.path.startswith("/size/"):
+                body = b"x" * int(self.path.rsplit("/", 1)[1])
+            else:
+                body = b"<html><body>coach</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}", hits
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def cached_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, "HTTP_CACHE_NAME", str(tmp_path / "cache"))
+    s = scraper.make_session(use_cache=True)
+    yield s
+    s.close()
+
+
+def bio_page(body: str) -> str:
+    return f"<html><body><div class='bio'>{body}</div></body></html>"
+
+
+# ============================ BIO: FAST PATH VS PARSE ============================
+
+def test_bio_fast_path_skips_parse(monkeypatch):
+    def no_parse(html):
+        raise AssertionError("parse_html non dovrebbe servire")
+
+    monkeypatch.setattr(scraper, "parse_html", no_parse)
+    url = f"{BASE}/staff/jsmith"
+    s = FakeSession({url: bio_page("<h1>John Smith</h1><p>Head Coach</p><a href='mailto:JSmith@Example.edu'>Email</a>")})
+    assert scraper.emails_from_bio(s, url) == {"jsmith@example.edu"}
+
+
+@pytest.mark.parametrize("role", [
+    "Graduate&nbsp;Assistant Coach",
+    "<b>Graduate</b>\n<b>Assistant</b>",
+    "Student<br>Assistant",
+])
+def test_bio_fast_path_honours_exclusions_in_visible_text(role):
+    url = f"{BASE}/staff/ga"
+    s = FakeSession({url: bio_page(f"<h1>Pat Doe</h1><p>{role}</p><a href='mailto:pdoe@example.edu'>Email</a>")})
+    assert scraper.emails_from_bio(s, url) == set()
+
+
+def parse_path_bio_emails(html):
+    """Percorso completo di emails_from_bio, senza la scorciatoia sui mailto."""
+    tree = scraper.parse_html(html)
+    if scraper.is_excluded_block(scraper.norm(scraper.deobfuscate(scraper.node_text(tree)))):
+        return set()
+    return scraper.extract_emails_anywhere(tree)
+
+
+@pytest.mark.parametrize("body", [
+    "<h1>John Smith</h1><p>Head Coach</p><a href='mailto:jsmith@example.edu'>Email</a>",
+    "<p>Assistant Coach</p><a href='mailto:A.Lee@Example.edu'>a</a> <a href='mailto:alee2@example.edu?subject=x'>b</a>",
+    "<p>Recruiting Coordinator</p><a href='mailto:rc@example.edu'>Email</a><p>More at sa.example.edu</p>",
+    "<p>Graduate&nbsp;Assistant</p><a href='mailto:ga@example.edu'>Email</a>",
+    "<p>Grad</p> <p>Asst</p><a href='mailto:ga2@example.edu'>Email</a>",
+    "<p>Director of Operations, GA</p><a href='mailto:ops@example.edu'>Email</a>",
+    "<!-- Graduate Assistant --><p>Head Coach</p><a href='mailto:hc@example.edu'>Email</a>",
+    "<p>Head Coach</p><!-- <a href='mailto:old.coach@example.edu'>old</a> --><a href='mailto:hc@example.edu'>Email</a>",
+    "<p>Head Coach</p><a href='mailto:hc@example.edu'>Email</a>"
+    "<script>document.write('<a href=\"mailto:webmaster@example.edu\">x</a>')</script>",
+    "<p>Head Coach</p><a href='mailto:hc@example.edu'>Email</a>"
+    "<script type='application/ld+json'>{\"email\": \"mailto:info@example.edu\"}</script>",
+    "<link rel='author' href='mailto:web@example.edu'><p>Head Coach</p><a href='mailto:hc@example.edu'>Email</a>",
+    "<p>Graduate <!-- a>b --> Assistant</p><a href='mailto:ga3@example.edu'>Email</a>",
+    "<p>Graduate <span title='a>b'>Assistant</span></p><a href='mailto:ga4@example.edu'>Email</a>",
+    "<p>Head Coach</p><a href='mailto:hc@example.edu'>Email</a><p>Office: office@example.edu</p>",
+    "<p>Head Coach</p><a href='MAILTO:hc@example.edu'>Email</a>",
+])
+def test_bio_fast_path_matches_parse_path(body):
+    url = f"{BASE}/staff/x"
+    html = bio_page(body)
+    assert scraper.emails_from_bio(FakeSession({url: html}), url) == parse_path_bio_emails(html)
+
+
+def test_bio_fast_path_matches_parse_path_on_random_bios():
+    pieces = [
+        "<p>Head Coach</p>", "<p>Assistant Coach</p>", "Graduate", "Assistant", " ", "<b>", "</b>", "<br>",
+        "&nbsp;", "GA", "<a href='mailto:c{n}@example.edu'>mail</a>", "<a class='x' href=\"mailto:d{n}@example.edu?s=1\">m</a>",
+        "<a href='MAILTO:u{n}@example.edu'>m</a>", "<a href='mailto:e{n}&#64;example.edu'>m</a>",
+        "<!-- <a href='mailto:old{n}@example.edu'>old</a> -->", "<!-- a>b -->", "<!-- Graduate Assistant -->",
+        "<script>document.write('mailto:web@example.edu')</script>", "<script>var s = 'Graduate Assistant';</script>",
+        "<style>.a>b {{}}</style>", "<template><p>Assistant</p></template>", "<link href='mailto:l@example.edu'>",
+        "<span title='a>b'>", "</span>", "t{n}@example.edu", "k{n} [at] example [dot] edu", "mailto:p{n}@example.edu",
+        "<span data-cfemail='5a3b2b1a3f223b372a363f743f3e2f'>x</span>",
+    ]
+    rnd = random.Random(13)
+    fast = 0
+    for _ in range(1000):
+        body = "".join(rnd.choice(pieces).replace("{n}", str(n)) for n in range(rnd.randint(1, 8)))
+        html = bio_page(body)
+        url = f"{BASE}/staff/r"
+        if scraper.bio_emails_without_parse(html) is not None:
+            fast += 1
+        assert scraper.emails_from_bio(FakeSession({url: html}), url) == parse_path_bio_emails(html), body
+    # La scorciatoia deve restare tale: una parte delle bio casuali la usa davvero
+    assert fast > 30
+
+
+@pytest.mark.parametrize("body", [
+    "<p>Head Coach</p><!-- <a href='mailto:old.coach@example.edu'>old</a> --><a href='mailto:hc@example.edu'>Email</a>",
+    "<p>Head Coach</p><script>var m = 'mailto:webmaster@example.edu';</script><a href='mailto:hc@example.edu'>x</a>",
+    "<link rel='author' href='mailto:web@example.edu'><p>Head Coach</p><a href='mailto:hc@example.edu'>Email</a>",
+    "<p>Head Coach</p><a href='mailto:hc@example.edu'>Email</a><p>Office: office@example.edu</p>",
+    "<p>Graduate <!-- a>b --> Assistant</p><a href='mailto:ga3@example.edu'>Email</a>",
+])
+def test_bio_fast_path_defers_when_html_is_ambiguous(body):
+    assert scraper.bio_emails_without_parse(bio_page(body)) is None
+
+
+def test_bio_parse_path_finds_obfuscated_email():
+    url = f"{BASE}/staff/kim"
+    s = FakeSession({url: bio_page("<p>Assistant Coach</p><p>Email: kim [at] example [dot] edu</p>")})
+    assert scraper.emails_from_bio(s, url) == {"kim@example.edu"}
+
+
+def test_bio_parse_path_honours_exclusions():
+    url = f"{BASE}/staff/lee"
+    s = FakeSession({url: bio_page("<p>Grad Asst</p><p>lee (at) example.edu</p>")})
+    assert scraper.emails_from_bio(s, url) == set()
+
+
+# ============================ FETCH: LIMITER E CACHE ============================
+
+def test_cached_pages_skip_the_limiter(http_server, cached_session):
+    base, hits = http_server
+    limiter = CountingLimiter()
+    first = scraper.fetch(cached_session, f"{base}/coaches", limiter=limiter)
+    second = scraper.fetch(cached_session, f"{base}/coaches", limiter=limiter)
+    assert first == second
+    assert hits == ["/coaches"]
+    assert limiter.hosts == [scraper.url_host(base)]
+
+
+def test_uncached_session_paces_every_request(http_server):
+    base, hits = http_server
+    limiter = CountingLimiter()
+    s = scraper.make_session(use_cache=False)
+    scraper.fetch(s, f"{base}/coaches", limiter=limiter)
+    scraper.fetch(s, f"{base}/coaches", limiter=limiter)
+    assert len(hits) == 2
+    assert len(limiter.hosts) == 2
+
+
+def test_page_cap_applies_before_the_cache(http_server, cached_session, monkeypatch):
+    base, hits = http_server
+    monkeypatch.setattr(scraper, "MAX_PAGE_BYTES", 100_000)
+    url = f"{base}/size/1000000"
+    assert len(scraper.fetch(cached_session, url)) == 100_000
+    assert len(scraper.fetch(cached_session, url)) == 100_000
+    assert hits == ["/size/1000000"]
+    stored = [len(r.content) for r in cached_session.cache.responses.values()]
+    assert stored == [100_000]
+
+
+# ============================ OFFUSCAMENTO ============================
+
+# deobfuscate originale: le sei regole applicate una dopo l'altra
+_OLD_OBFUSCATIONS = [
+    (re.compile(r"\s*\[at\]\s*", re.IGNORECASE), "@"),
+    (re.compile(r"\s*\(at\)\s*", re.IGNORECASE), "@"),
+    (re.compile(r"\s+at\s+", re.IGNORECASE), "@"),
+    (re.compile(r"\s*\[dot\]\s*", re.IGNORECASE), "."),
+    (re.compile(r"\s*\(dot\)\s*", re.IGNORECASE), "."),
+    (re.compile(r"\s+dot\s+", re.IGNORECASE), "."),
+]
+
+
+def old_deobfuscate(text):
+    for pat, repl in _OLD_OBFUSCATIONS:
+        text = pat.sub(repl, text)
+    return text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("jsmith [at] example [dot] edu", "jsmith@example.edu"),
+    ("jsmith (AT) example (Dot) edu", "jsmith@example.edu"),
+    ("jsmith at example dot edu", "jsmith@example.edu"),
+    ("Call the athletics office at 555-1234", "Call the athletics office@555-1234"),
+    ("data statistics", "data statistics"),
+    (" AT [at]x", " AT@x"),
+    ("a\tdot\n(at)", "a\tdot@"),
+])
+def test_deobfuscate(text, expected):
+    assert scraper.deobfuscate(text) == expected
+    assert old_deobfuscate(text) == expected
+
+
+def test_deobfuscate_matches_sequential_rules_on_random_text():
+    atoms = ["at", "AT", "dot", "[at]", "(at)", "[dot]", "(dot)", " ", "  ", "\n", "x", "a", "t", "cat", "@", "."]
+    rnd = random.Random(7)
+    for _ in range(5000):
+        text = "".join(rnd.choice(atoms) for _ in range(rnd.randint(1, 10)))
+        assert scraper.deobfuscate(text) == old_deobfuscate(text), text
+
+
+def test_find_emails_after_deobfuscate():
+    text = scraper.deobfuscate("Coach Kim: kim [at] example [dot] edu, Lee: lee at example dot edu")
+    assert scraper.find_emails(text) == ["kim@example.edu", "lee@example.edu"]
+
+
+# ============================ RUOLI E SPORT ============================
+
+# Controlli originali: una ricerca di sottostringa per keyword, esclusioni prima dei ruoli
+_OLD_ABBREV = [re.compile(p, re.IGNORECASE) for p in (r"\bga\b", r"\bg\.a\.\b", r"\bsa\b", r"\bs\.a\.\b")]
+
+
+def old_is_excluded_block(text):
+    return any(k in text for k in scraper.EXCLUDE_ROLE_KEYWORDS) or any(p.search(text) for p in _OLD_ABBREV)
+
+
+def old_is_target_block(text):
+    return not old_is_excluded_block(text) and any(k in text for k in scraper.TARGET_ROLE_KEYWORDS)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("John Smith Head Coach jsmith@example.edu", True),
+    ("Pat Doe Director of Recruiting", True),
+    ("Kim Lee Graduate Assistant Coach", False),
+    ("Lee Park Student Asst. Coach", False),
+    ("Max Roe GA - Coach", False),
+    ("Ann Poe SA Coach", False),
+    ("Dana Fox Assistant Coach, Gas station sponsor", True),
+    ("Ticket Office Manager", False),
+])
+def test_role_include_exclude(text, expected):
+    bt = scraper.norm(text)
+    assert scraper.is_target_block(bt) is expected
+    assert old_is_target_block(bt) is expected
+
+
+def test_role_checks_match_substring_loops_on_random_text():
+    atoms = scraper.TARGET_ROLE_KEYWORDS + scraper.EXCLUDE_ROLE_KEYWORDS + [
+        "ga", "g.a.", "sa", "s.a.", "gas", "usa", "assistant", "student", "grad", "-", "x", " ",
+    ]
+    rnd = random.Random(11)
+    for _ in range(5000):
+        bt = scraper.norm(" ".join(rnd.choice(atoms) for _ in range(rnd.randint(1, 6))))
+        assert scraper.is_excluded_block(bt) is old_is_excluded_block(bt), bt
+        assert scraper.is_target_block(bt) is old_is_target_block(bt), bt
+
+
+@pytest.mark.parametrize("sport, text, expected", [
+    ("Men's Basketball", "john smith head coach men's basketball", True),
+    ("Men's Basketball", "john smith head coach mbkb", True),
+    ("Men's Basketball", "john smith head coach soccer", False),
+    ("Women's Swimming & Diving", "kim lee head coach swimming and diving", True),
+    ("Women's Swimming & Diving", "kim lee diving coach", False),
+    ("Women's Swimming & Diving", "kim lee head coach swim & dive", True),
+    ("Women's Soccer", "ann poe assistant coach wsoc", True),
+])
+def test_sport_filter(sport, text, expected):
+    assert scraper.sport_filter(sport)(text) is expected
+
+
+# ============================ EMAIL DEI BLOCCHI TARGET ============================
+
+def cf_encode(email, key=0x5A):
+    return f"{key:02x}" + "".join(f"{ord(c) ^ key:02x}" for c in email)
+
+
+STAFF_PAGE = f"""<html><body>
+<a href="mailto:office@example.edu">Athletics office</a>
+<div class="staff-member"><h3>John Smith</h3><p>Head Coach</p>
+  <a href="mailto:JSmith@Example.edu?subject=Hi">Email</a></div>
+<div class="staff-member"><h3>Kim Lee</h3><p>Assistant Coach</p>
+  <a href="/cdn-cgi/l/email-protection#{cf_encode('kim@example.edu')}">[email&#160;protected]</a></div>
+<div class="staff-member" data-cfemail="{cf_encode('ann@example.edu')}"><h3>Ann Poe</h3><p>Associate Head Coach</p></div>
+<div class="staff-member"><h3>Max Roe</h3><p>Recruiting Coordinator</p>
+  <span class="__cf_email__" data-cfemail="{cf_encode('max@example.edu')}">[email protected]</span>
+  or lee [at] example [dot] edu</div>
+<div class="staff-member"><h3>Pat Doe</h3><p>Graduate Assistant Coach</p>
+  <a href="mailto:pdoe@example.edu">Email</a></div>
+<div class="staff-member"><h3>Tickets</h3><p>Box office</p><a href="mailto:tickets@example.edu">Email</a></div>
+<div class="staff-member"><p>Coaching staff</p>
+  <div class="staff-member"><p>Volunteer Coach</p><a href="mailto:vol@example.edu">Email</a></div></div>
+</body></html>"""
+
+
+def per_block_emails(blocks):
+    """Estrazione precedente alla XPath unica: mailto e Cloudflare cercati blocco per blocco."""
+    emails = set()
+    for b, _ in blocks:
+        for href in scraper._MAILTO_HREF_XP(b):
+            e = scraper.mailto_address(href)
+            if e:
+                emails.add(e)
+        emails.update(scraper.cloudflare_emails(b))
+    emails.update(scraper.find_emails("\x00".join(text for _, text in blocks)))
+    return scraper.clean_emails(emails)
+
+
+def test_decode_cfemail():
+    assert scraper.decode_cfemail(cf_encode("Coach.Kim@example.edu")) == "Coach.Kim@example.edu"
+    assert scraper.decode_cfemail(cf_encode("kim@example.edu", key=0x00)) == "kim@example.edu"
+    assert scraper.decode_cfemail("zz") == ""
+    assert scraper.decode_cfemail("5a") == ""
+    assert scraper.decode_cfemail("") == ""
+
+
+def test_cf_address_validates_both_payload_forms():
+    payload = cf_encode("kim@example.edu")
+    assert scraper._cf_address(payload) == "kim@example.edu"
+    assert scraper._cf_address(f" {payload} ") == "kim@example.edu"
+    assert scraper._cf_address(f"/cdn-cgi/l/email-protection#{payload}") == "kim@example.edu"
+    assert scraper._cf_address(cf_encode("not an email")) is None
+    assert scraper._cf_address("zz") is None
+
+
+def test_target_emails_from_staff_page():
+    emails, blocks = scraper.analyze_page(STAFF_PAGE, "Men's Basketball", require_sport_match=False)
+    assert emails == {
+        "jsmith@example.edu", "kim@example.edu", "ann@example.edu",
+        "max@example.edu", "lee@example.edu", "vol@example.edu",
+    }
+    assert emails == per_block_emails(blocks)
+
+
+def test_page_level_xpath_matches_per_block_extraction_on_random_pages():
+    pieces = [
+        "<p>Head Coach</p>", "<p>Ticket Office</p>", "<p>Graduate Assistant</p>",
+        "<a href='mailto:a{n}@example.edu'>mail</a>", "<a href='https://example.edu/x'>link</a>",
+        "<span data-cfemail='{cf}'>x</span>", "<a href='/cdn-cgi/l/email-protection#{cf}'>x</a>",
+        "b{n} [at] example [dot] edu",
+    ]
+    rnd = random.Random(5)
+    for _ in range(200):
+        parts = []
+        for n in range(rnd.randint(5, 9)):
+            inner = "".join(rnd.choice(pieces) for _ in range(rnd.randint(1, 4)))
+            if rnd.random() < 0.3:
+                inner += f"<div class='coach'>{rnd.choice(pieces)}</div>"
+            attr = f" data-cfemail='{cf_encode(f'own{n}@example.edu')}'" if rnd.random() < 0.2 else ""
+            block = f"<div class='coach'{attr}>{inner}</div>"
+            parts.append(block.replace("{n}", str(n)).replace("{cf}", cf_encode(f"cf{n}@example.edu")))
+        html = "<html><body><a href='mailto:outside@example.edu'>x</a>" + "".join(parts) + "</body></html>"
+        emails, blocks = scraper.analyze_page(html, "Men's Basketball", require_sport_match=False)
+        assert "outside@example.edu" not in emails
+        assert emails == per_block_emails(blocks), html
+
+
+# ============================ RIGHE DUPLICATE ============================
+
+def test_duplicate_rows_are_scraped_once_and_written_to_every_row():
+    staff = f"{BASE}/mbb/coaches"
+    swim = f"{BASE}/swim/staff"
+    s = FakeSession({staff: STAFF_PAGE, swim: STAFF_PAGE.replace("Head Coach", "Head Swim Coach")})
+    mbb = scraper.Target("State U", "Men's Basketball", staff)
+    wsd = scraper.Target("State U", "Women's Swimming & Diving", swim)
+    targets = [mbb, wsd, scraper.Target("State U", "Men's Basketball", staff), mbb]
+
+    results = [None] * len(targets)
+    for idxs, t, emails in scraper.run_unique_targets(s, targets, sleep_s=0, max_workers=2):
+        for idx in idxs:
+            results[idx] = (t.university, scraper.join_emails(emails))
+
+    # Stesso risultato di ogni riga processata per conto suo, con una GET per URL distinto
+    alone = [("State U", scraper.join_emails(scraper.process_one_target(FakeSession(s.pages), t, 0)))
+             for t in targets]
+    assert results == alone
+    assert results[0] == results[2] == results[3]
+    assert sorted(s.calls) == sorted([staff, swim])